@@ -0,0 +1,192 @@
+"""Headless benchmarks over the bundled patterns.
+
+For every pattern under `patterns/` this measures how long the file takes to
+parse and decode, how long the initial pattern generator takes, and how fast
+the engine steps (steps/s and million cells updated per second) at several
+grid sizes and worker counts, together with the peak memory of each run.
+Results are written as JSON so runs from different commits can be compared:
+
+    python src/benchmark.py --output before.json
+    ... change things ...
+    python src/benchmark.py --output after.json --compare before.json
+
+Only NumPy is needed; neither Qt nor VTK is imported.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from rd_engine import RDSystem, read_data_arrays
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PATTERNS_DIR = os.path.join(ROOT_DIR, 'patterns')
+
+
+def find_patterns(root_dir: str = PATTERNS_DIR):
+    paths = []
+    for dirpath, _, filenames in os.walk(root_dir):
+        for name in filenames:
+            if os.path.splitext(name)[1].lower() in ('.vti', '.vtu'):
+                paths.append(os.path.join(dirpath, name))
+    return sorted(paths, key=lambda p: p.lower())
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or 'unknown'
+    except Exception:
+        return 'unknown'
+
+
+def time_decode(path: str) -> dict:
+    """Time the XML parse and the decoding of every DataArray in the file."""
+    t0 = time.perf_counter()
+    root = ET.parse(path).getroot()
+    t1 = time.perf_counter()
+    values = 0
+    for piece in root.iter('Piece'):
+        for section in piece.iter():
+            if section is not piece and section.find('DataArray') is not None:
+                values += sum(a.size for a in read_data_arrays(root, section).values())
+    t2 = time.perf_counter()
+    return {'type': root.get('type'), 'parse_s': t1 - t0, 'decode_s': t2 - t1, 'values_decoded': values}
+
+
+def scaled_dimensions(system: RDSystem, size: int):
+    """Grid of edge `size` along each axis the pattern actually uses, as (x, y, z)."""
+    nz, ny, nx = system.shape
+    return tuple(size if n > 1 else 1 for n in (nx, ny, nz))
+
+
+def time_steps(path: str, dims, workers: int, steps: int) -> dict:
+    with RDSystem(path, workers=workers) as system:
+        system.set_dimensions(*dims)
+        system.step(1)  # warm up the thread pool and caches
+        t0 = time.perf_counter()
+        system.step(steps)
+        elapsed = time.perf_counter() - t0
+        cells = system.number_of_cells
+        # peak memory is taken separately so tracing does not skew the timing;
+        # resizing again inside the trace counts a fresh set of chemicals only
+        tracemalloc.start()
+        system.set_dimensions(*dims)
+        system.step(2)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        'dimensions': list(dims), 'workers': workers, 'steps': steps, 'seconds': elapsed,
+        'steps_per_s': steps / elapsed if elapsed else float('inf'),
+        'mcells_per_s': steps * cells / elapsed / 1e6 if elapsed else float('inf'),
+        'peak_mb': peak / 2 ** 20,
+    }
+
+
+def benchmark_pattern(path: str, sizes, sizes_3d, workers, steps: int) -> dict:
+    result = {'pattern': os.path.relpath(path, ROOT_DIR).replace(os.sep, '/')}
+    result.update(time_decode(path))
+    try:
+        t0 = time.perf_counter()
+        system = RDSystem(path)
+        result['load_s'] = time.perf_counter() - t0
+    except ValueError as e:
+        result['skipped'] = str(e)
+        return result
+    result['dimensions'] = list(system.shape[::-1])
+    generator = system.initial_pattern_generator
+    if generator is not None:
+        t0 = time.perf_counter()
+        system.generate_initial_pattern(generator)
+        result['generate_s'] = time.perf_counter() - t0
+    result['runs'] = []
+    for size in (sizes_3d if system.dimensionality == 3 else sizes):
+        dims = scaled_dimensions(system, size)
+        for w in workers:
+            result['runs'].append(time_steps(path, dims, w, steps))
+    return result
+
+
+def run(args) -> dict:
+    patterns = args.patterns or find_patterns()
+    report = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'steps': args.steps,
+        'patterns': [],
+    }
+    for path in patterns:
+        np.random.seed(0)
+        entry = benchmark_pattern(path, args.sizes, args.sizes_3d, args.workers, args.steps)
+        report['patterns'].append(entry)
+        print(format_entry(entry), flush=True)
+    return report
+
+
+def format_entry(entry: dict) -> str:
+    lines = [f"{entry['pattern']}: parse {entry['parse_s'] * 1e3:.1f} ms, decode {entry['decode_s'] * 1e3:.1f} ms"]
+    if 'skipped' in entry:
+        lines.append(f"  not run: {entry['skipped']}")
+        return '\n'.join(lines)
+    if 'generate_s' in entry:
+        lines[0] += f", generate {entry['generate_s'] * 1e3:.1f} ms"
+    for r in entry['runs']:
+        dims = 'x'.join(str(d) for d in r['dimensions'])
+        lines.append(f"  {dims:>12} workers={r['workers']}: {r['steps_per_s']:9.1f} steps/s "
+                     f"{r['mcells_per_s']:8.2f} Mcells/s  peak {r['peak_mb']:.1f} MB")
+    return '\n'.join(lines)
+
+
+def compare(report: dict, baseline: dict) -> str:
+    """Summarise Mcells/s of `report` relative to a `baseline` report."""
+    def key(entry, r):
+        return entry['pattern'], tuple(r['dimensions']), r['workers']
+
+    old = {key(e, r): r for e in baseline.get('patterns', []) for r in e.get('runs', [])}
+    lines = [f"Compared with {baseline.get('revision', '?')} ({baseline.get('timestamp', '?')}):"]
+    for entry in report['patterns']:
+        for r in entry.get('runs', []):
+            before = old.get(key(entry, r))
+            if before and before['mcells_per_s']:
+                ratio = r['mcells_per_s'] / before['mcells_per_s']
+                dims = 'x'.join(str(d) for d in r['dimensions'])
+                lines.append(f"  {entry['pattern']} {dims} workers={r['workers']}: {ratio:.2f}x")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the bundled patterns (headless).')
+    parser.add_argument('patterns', nargs='*', help='pattern files (default: everything under patterns/)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[64, 128, 256],
+                        help='grid edge lengths for 1D and 2D patterns')
+    parser.add_argument('--sizes-3d', type=int, nargs='+', default=[32, 64],
+                        help='grid edge lengths for 3D patterns')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='worker counts to try')
+    parser.add_argument('--steps', type=int, default=50, help='timed steps per run')
+    parser.add_argument('--output', default='benchmark.json', help='where to write the JSON results')
+    parser.add_argument('--compare', metavar='JSON', help='earlier results to compare against')
+    args = parser.parse_args()
+
+    report = run(args)
+    with open(args.output, 'w') as fh:
+        json.dump(report, fh, indent=2)
+    print(f'Results written to {args.output}')
+    if args.compare:
+        with open(args.compare) as fh:
+            print(compare(report, json.load(fh)))
+
+
+if __name__ == '__main__':
+    main()
@@ -48,7 +48,8 @@ class InfoPanel(QWidget):
 
     def show_file(self, path: str):
         """Display information and a safe text preview for `path`.
-        For .vti/.vtu files, show a summary of the XML structure using XMLFileParser.
+        For .vti/.vtu files, show the pattern metadata read by
+        `XMLFileParser.parse_header`, which never touches the array data.
         """
         if not path:
             self.set_info('No file selected')
@@ -69,9 +70,7 @@ class InfoPanel(QWidget):
             if ext in ('.vti', '.vtu', '.xml'):
                 try:
                     parser = XMLFileParser(path)
-                    parser.parse()
-                    xml_summary = parser.get_summary()
-                    body = f'XML Structure Summary:\n\n{xml_summary}'
+                    body = self.format_header(parser.parse_header())
                 except Exception as e:
                     body = f'Failed to parse XML: {e}'
                 self.set_info('\n'.join(header + [body]))
@@ -108,6 +107,56 @@ class InfoPanel(QWidget):
             self.set_info(f'Failed to read file: {path}\nError: {e}')
 
 
+    def format_header(self, header: dict) -> str:
+        """Lay out the metadata returned by `XMLFileParser.parse_header`."""
+        rule = header.get('rule', {})
+        lines = []
+
+        def add(label, value):
+            if value not in (None, ''):
+                lines.append(f'{label}: {value}')
+
+        add(self.rule_name_label, rule.get('name'))
+        add(self.rule_type_label, rule.get('type'))
+        add(self.num_chemicals_label, header.get('number_of_chemicals'))
+        dims = header.get('dimensions')
+        if dims:
+            add(self.dimensions_label, ' x '.join(str(d) for d in dims))
+        elif header.get('number_of_points'):
+            add(self.dimensions_label, f"mesh, {header['number_of_points']:,} points")
+        if header.get('number_of_cells') is not None:
+            add(self.number_of_cells_label, f"{header['number_of_cells']:,}")
+        if 'wrap' in rule:
+            add(self.wrap_label, 'yes' if rule['wrap'] == '1' else 'no')
+        add(self.data_type_label, rule.get('data_type'))
+        add(self.neighborhood_type_label, rule.get('neighborhood_type'))
+        add(self.neighborhood_range_label, rule.get('neighborhood_range'))
+        add(self.neighborhood_weight_label, rule.get('neighborhood_weight'))
+        accuracy = rule.get('accuracy')
+        if accuracy is not None and accuracy.isdigit() and int(accuracy) < len(self.accuracy_labels):
+            accuracy = self.accuracy_labels[int(accuracy)]
+        add(self.accuracy_label, accuracy)
+        kernel_attrs = header.get('kernel_attributes', {})
+        block = [kernel_attrs.get(f'block_size_{axis}') for axis in 'xyz']
+        if any(block):
+            add(self.block_size_label, ' x '.join(b or '1' for b in block))
+        if 'use_local_memory' in kernel_attrs:
+            add(self.use_local_memory_label, 'yes' if kernel_attrs['use_local_memory'] in ('1', 'true') else 'no')
+
+        if header.get('params'):
+            lines.append('')
+            lines.append('Parameters:')
+            lines.extend(f'  {name} = {value}' for name, value in header['params'])
+        for label, key in ((self.formula_label, 'formula'), (self.kernel_label, 'kernel')):
+            if header.get(key):
+                lines.extend(['', f'{label}:', header[key]])
+        if header.get('description'):
+            lines.extend(['', f'{self.description_label}:', header['description']])
+        if not lines:
+            return 'No Ready pattern metadata found.'
+        return '\n'.join(lines)
+
+
 def format_size(n: int) -> str:
     """Human readable size."""
     try:
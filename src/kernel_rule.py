@@ -0,0 +1,97 @@
+import ast
+import textwrap
+from types import SimpleNamespace
+from typing import Callable
+
+import numpy as np
+
+
+# everything a kernel can reach through `np`: all ufuncs plus a few array helpers
+NUMPY_NAMES = {name for name in dir(np) if isinstance(getattr(np, name), np.ufunc)} | {
+    'where', 'clip', 'sum', 'mean', 'amin', 'amax', 'zeros_like', 'ones_like',
+    'empty_like', 'full_like', 'float32', 'float64', 'pi', 'e', 'inf', 'nan',
+}
+ARRAY_ATTRIBUTES = {
+    'shape', 'ndim', 'size', 'dtype', 'T', 'astype', 'copy', 'reshape',
+    'sum', 'mean', 'min', 'max', 'clip', 'fill',
+}
+OTHER_ATTRIBUTES = {
+    'get', 'items', 'keys', 'values',  # dicts of chemicals and params
+    'laplacian', 'offset',             # KernelNeighbours
+}
+SAFE_BUILTINS = {
+    'abs': abs, 'min': min, 'max': max, 'pow': pow, 'round': round, 'sum': sum,
+    'len': len, 'range': range, 'zip': zip, 'enumerate': enumerate,
+    'float': float, 'int': int, 'bool': bool, 'dict': dict, 'list': list, 'tuple': tuple,
+}
+
+
+class KernelNeighbours:
+    """Neighbourhood access for one tile, handed to a kernel as `neighbours`.
+
+    `laplacian(name)` uses the same stencil as formula rules and
+    `offset(name, dx, dy, dz)` returns the chemical shifted by up to one cell
+    (boundaries wrap or copy the edge as set by the rule).
+    """
+
+    def __init__(self, system, padded, region):
+        self._system = system
+        self._padded = padded
+        self._region = region
+
+    def _padded_for(self, name: str) -> np.ndarray:
+        return self._padded[self._system.chemical_names.index(name)]
+
+    def laplacian(self, name: str) -> np.ndarray:
+        return self._system._laplacian_tile(self._padded_for(name), self._region)
+
+    def offset(self, name: str, dx: int = 0, dy: int = 0, dz: int = 0) -> np.ndarray:
+        if max(abs(dx), abs(dy), abs(dz)) > 1:
+            raise ValueError('Kernels can only reach neighbours one cell away')
+        pad = [p[0] for p in self._system._pad]
+        index = tuple(slice(r.start + p + o * p, r.stop + p + o * p)
+                      for r, p, o in zip(self._region, pad, (dz, dy, dx)))
+        return self._padded_for(name)[index]
+
+
+def _check_source(tree: ast.AST):
+    """Reject anything other than plain NumPy arithmetic on the arguments."""
+    allowed_attributes = NUMPY_NAMES | ARRAY_ATTRIBUTES | OTHER_ATTRIBUTES
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom, ast.Global, ast.Nonlocal,
+                             ast.ClassDef, ast.AsyncFunctionDef, ast.With, ast.AsyncWith,
+                             ast.Try, ast.Raise, ast.Delete, ast.Await, ast.Yield, ast.YieldFrom)):
+            raise ValueError(f'Kernel may not use {type(node).__name__} (line {node.lineno})')
+        if isinstance(node, ast.Name) and node.id.startswith('_'):
+            raise ValueError(f'Kernel may not use name {node.id} (line {node.lineno})')
+        if isinstance(node, ast.Attribute) and node.attr not in allowed_attributes:
+            raise ValueError(f'Kernel may not use attribute .{node.attr} (line {node.lineno})')
+
+
+def load_kernel(source: str, function_name: str = 'rd_compute') -> Callable:
+    """Compile the Python body of a kernel rule and return its kernel function.
+
+    The function is called once per tile as
+    `function(chemicals, neighbours, params)` where `chemicals` maps names to
+    arrays, `neighbours` is a `KernelNeighbours` and `params` holds the rule
+    parameters plus `x_pos`, `y_pos` and `z_pos`. It returns a dict of new
+    values; chemicals it leaves out are unchanged.
+
+    The source is checked to use only NumPy functions (through `np`), array
+    arithmetic and a few harmless builtins, and runs without the normal
+    builtins. This keeps kernels to array maths; it is a guard against
+    careless patterns rather than a hardened security boundary.
+    """
+    source = textwrap.dedent(source).strip('\n')
+    try:
+        tree = ast.parse(source, '<kernel>')
+    except SyntaxError as e:
+        raise ValueError(f'Cannot compile kernel: {e}')
+    _check_source(tree)
+    namespace = {'__builtins__': SAFE_BUILTINS,
+                 'np': SimpleNamespace(**{name: getattr(np, name) for name in NUMPY_NAMES})}
+    exec(compile(tree, '<kernel>', 'exec'), namespace)
+    function = namespace.get(function_name)
+    if not callable(function):
+        raise ValueError(f'Kernel does not define a function called {function_name}')
+    return function
@@ -1,3 +1,6 @@
+import time
+_START = time.perf_counter()
+
 import sys
 from PyQt5.QtWidgets import QApplication
 from ready_gui import MainWindow
@@ -7,6 +10,9 @@ def main():
     app = QApplication(sys.argv)
     w = MainWindow()
     w.show()
+    if '--startup-time' in sys.argv:
+        w.first_painted.connect(lambda: print(f'Startup to first paint: {time.perf_counter() - _START:.3f} s'))
+        w.startup_finished.connect(lambda: print(f'Deferred start-up done: {time.perf_counter() - _START:.3f} s'))
     sys.exit(app.exec_())
 
 
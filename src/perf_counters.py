@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import Dict
+
+
+class PerfCounters:
+    """Low-overhead wall-clock counters for the phases of a run.
+
+    Wrap each phase in `with counters.phase('laplacian'):`. While disabled
+    `phase()` hands back a shared no-op context, so instrumented code costs a
+    method call per phase. Rates (steps/s, Mcells/s, the time spent inside
+    each frame and the interval between frames) are measured from the last
+    `reset()`.
+
+    Example for scripts::
+
+        system.perf.enable()
+        system.step(500)
+        print(system.perf.report())
+    """
+
+    _NULL = nullcontext()
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self):
+        if not self.enabled:
+            self.reset()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.totals: Dict[str, float] = defaultdict(float)
+            self.counts: Dict[str, int] = defaultdict(int)
+            self.steps = 0
+            self.cell_updates = 0
+            self.frames = 0
+            self.frame_seconds = 0.0
+            self._start = time.perf_counter()
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return self._NULL
+        return _Phase(self, name)
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            self.totals[name] += seconds
+            self.counts[name] += 1
+
+    def count_steps(self, steps: int, cells: int):
+        if self.enabled:
+            self.steps += steps
+            self.cell_updates += steps * cells
+
+    def count_frame(self, seconds: float = 0.0):
+        """Count a frame that took `seconds` of work (stepping, upload, render)."""
+        if self.enabled:
+            self.frames += 1
+            self.frame_seconds += seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def summary(self) -> Dict[str, object]:
+        """Rates since the last reset plus per-phase totals in milliseconds."""
+        elapsed = self.elapsed()
+        frames = max(self.frames, 1)
+        return {
+            'elapsed_s': elapsed,
+            'steps_per_s': self.steps / elapsed if elapsed else 0.0,
+            'mcells_per_s': self.cell_updates / elapsed / 1e6 if elapsed else 0.0,
+            'ms_per_frame': self.frame_seconds * 1e3 / frames if self.frames else 0.0,
+            'frame_interval_ms': elapsed * 1e3 / frames if self.frames else 0.0,
+            'phases_ms': {name: total * 1e3 for name, total in self.totals.items()},
+            'phases_ms_per_frame': {name: total * 1e3 / frames for name, total in self.totals.items()},
+        }
+
+    def report(self) -> str:
+        s = self.summary()
+        lines = [f"{s['steps_per_s']:.1f} steps/s, {s['mcells_per_s']:.2f} Mcells/s over {s['elapsed_s']:.2f} s"]
+        for name, ms in sorted(s['phases_ms'].items(), key=lambda kv: -kv[1]):
+            lines.append(f'  {name:<14} {ms:10.1f} ms  ({self.counts[name]} calls)')
+        return '\n'.join(lines)
+
+
+class _Phase:
+    __slots__ = ('counters', 'name', 'start')
+
+    def __init__(self, counters: PerfCounters, name: str):
+        self.counters = counters
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.counters.add(self.name, time.perf_counter() - self.start)
+        return False
@@ -0,0 +1,631 @@
+import ast
+import base64
+import re
+import textwrap
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from kernel_rule import KernelNeighbours, load_kernel
+from perf_counters import PerfCounters
+
+
+VTK_TYPES = {
+    'Int8': np.int8, 'UInt8': np.uint8, 'Int16': np.int16, 'UInt16': np.uint16,
+    'Int32': np.int32, 'UInt32': np.uint32, 'Int64': np.int64, 'UInt64': np.uint64,
+    'Float32': np.float32, 'Float64': np.float64,
+}
+
+# functions available to formula rules, named as in OpenCL C
+FORMULA_FUNCTIONS = {
+    'fmod': np.fmod, 'fabs': np.abs, 'sqrt': np.sqrt, 'pow': np.power,
+    'exp': np.exp, 'log': np.log, 'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'tanh': np.tanh, 'floor': np.floor, 'ceil': np.ceil,
+    'min': np.minimum, 'max': np.maximum, 'fmin': np.fmin, 'fmax': np.fmax,
+    'clamp': np.clip,
+}
+
+
+def _b64_length(nbytes: int) -> int:
+    return 4 * ((nbytes + 2) // 3)
+
+
+def decode_binary(text: str, dtype, header_type: str = 'UInt32', compressed: bool = True) -> np.ndarray:
+    """Decode a base64 VTK XML data block (inline `binary` or `appended`).
+
+    `text` must have its whitespace removed; anything after the block is ignored.
+    """
+    htype = np.uint64 if header_type == 'UInt64' else np.uint32
+    hsize = np.dtype(htype).itemsize
+    if compressed:
+        # header: [number of blocks, block size, last block size, compressed sizes...]
+        nblocks = int(np.frombuffer(base64.b64decode(text[:_b64_length(3 * hsize)]), htype)[0])
+        hlen = _b64_length((3 + nblocks) * hsize)
+        sizes = np.frombuffer(base64.b64decode(text[:hlen]), htype)[3:]
+        data = base64.b64decode(text[hlen:hlen + _b64_length(int(sizes.sum()))])
+        blocks = []
+        pos = 0
+        for size in sizes:
+            blocks.append(zlib.decompress(data[pos:pos + int(size)]))
+            pos += int(size)
+        raw = b''.join(blocks)
+    else:
+        hlen = _b64_length(hsize)
+        nbytes = int(np.frombuffer(base64.b64decode(text[:hlen]), htype)[0])
+        raw = base64.b64decode(text[hlen:hlen + _b64_length(nbytes)])[:nbytes]
+    return np.frombuffer(raw, dtype).copy()
+
+
+def read_data_arrays(root: ET.Element, section: ET.Element) -> Dict[str, np.ndarray]:
+    """Return the DataArrays of `section` (e.g. PointData) keyed by name.
+
+    Multi-component arrays are returned with shape (n, components).
+    """
+    header_type = root.get('header_type', 'UInt32')
+    compressed = root.get('compressor') is not None
+    appended = None
+    arrays = {}
+    for da in section.findall('DataArray'):
+        dtype = VTK_TYPES[da.get('type', 'Float32')]
+        fmt = da.get('format', 'ascii')
+        if fmt == 'ascii':
+            values = np.array((da.text or '').split(), dtype=dtype)
+        elif fmt == 'binary':
+            values = decode_binary(''.join((da.text or '').split()), dtype, header_type, compressed)
+        elif fmt == 'appended':
+            if appended is None:
+                node = root.find('AppendedData')
+                if node is None or node.get('encoding') != 'base64':
+                    raise ValueError('Only base64-encoded appended data is supported')
+                appended = ''.join(node.text.split()).lstrip('_')
+            offset = int(da.get('offset', '0'))
+            values = decode_binary(appended[offset:], dtype, header_type, compressed)
+        else:
+            raise ValueError(f'Unsupported DataArray format: {fmt}')
+        ncomp = int(da.get('NumberOfComponents', '1'))
+        if ncomp > 1:
+            values = values.reshape(-1, ncomp)
+        arrays[da.get('Name')] = values
+    return arrays
+
+
+def translate_formula(text: str) -> str:
+    """Turn the OpenCL-flavoured body of a formula rule into Python statements."""
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'//[^\n]*', '', text)
+    lines = []
+    for statement in text.split(';'):
+        statement = ' '.join(statement.split())
+        if not statement:
+            continue
+        # drop declarations ("float4 k = ...") and float suffixes ("1.0f")
+        statement = re.sub(r'^(?:const\s+)?(?:float[248]?|double|int)\s+', '', statement)
+        statement = re.sub(r'\b((?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?)[fF]\b', r'\1', statement)
+        lines.append(statement)
+    return '\n'.join(lines)
+
+
+_FORMULA_NODES = (ast.Module, ast.Assign, ast.AugAssign, ast.BinOp, ast.UnaryOp, ast.Compare,
+                  ast.Name, ast.Constant, ast.Call, ast.operator, ast.unaryop, ast.cmpop,
+                  ast.expr_context)
+
+
+def check_formula(formula: str, known_names) -> ast.Module:
+    """Parse a translated formula and reject anything but arithmetic.
+
+    Only assignments to plain names, arithmetic, comparisons, numbers and
+    calls of `FORMULA_FUNCTIONS` are allowed, and every name read must be in
+    `known_names` or assigned earlier in the formula. Raises ValueError.
+    """
+    try:
+        tree = ast.parse(formula, '<formula>')
+    except SyntaxError as e:
+        raise ValueError(f'Cannot translate formula: {e}')
+    defined = set(known_names) | set(FORMULA_FUNCTIONS)
+    for statement in tree.body:
+        for node in ast.walk(statement):
+            if not isinstance(node, _FORMULA_NODES):
+                raise ValueError(f'Formula may not use {type(node).__name__} (line {node.lineno})')
+            if isinstance(node, (ast.Assign, ast.AugAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                if not all(isinstance(t, ast.Name) for t in targets):
+                    raise ValueError(f'Formula can only assign to plain names (line {node.lineno})')
+            if isinstance(node, ast.Call):
+                if not isinstance(node.func, ast.Name):
+                    raise ValueError(f'Formula may not use {type(node.func).__name__} (line {node.lineno})')
+                if node.func.id not in FORMULA_FUNCTIONS or node.keywords:
+                    raise ValueError(f'Formula calls unsupported function {node.func.id} (line {node.lineno})')
+            reads = isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)
+            if isinstance(node, ast.AugAssign):
+                reads, node = True, node.target
+            if reads and node.id not in defined:
+                raise ValueError(f'Formula uses unknown name {node.id} (line {node.lineno})')
+        for node in ast.walk(statement):
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                defined.add(node.id)
+    return tree
+
+
+class RunMonitor:
+    """Watches a running system for convergence to a steady state or blow-up.
+
+    Every `check_interval` timesteps the system hands over the chemicals from
+    before and after the step and the monitor computes cheap per-chemical
+    reductions: min, max, mean and the largest rate of change. A run is
+    `steady` once no chemical changes faster than `steady_tolerance` per unit
+    time, and `diverged` as soon as a value is NaN/inf or exceeds
+    `divergence_limit` in magnitude.
+    """
+
+    RUNNING = 'running'
+    STEADY = 'steady'
+    DIVERGED = 'diverged'
+
+    def __init__(self, check_interval: int = 100, steady_tolerance: float = 1e-6,
+                 divergence_limit: float = 1e6, stop_on_steady: bool = True,
+                 stop_on_divergence: bool = True):
+        self.check_interval = max(1, int(check_interval))
+        self.steady_tolerance = steady_tolerance
+        self.divergence_limit = divergence_limit
+        self.stop_on_steady = stop_on_steady
+        self.stop_on_divergence = stop_on_divergence
+        self.status = self.RUNNING
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def reset(self):
+        self.status = self.RUNNING
+        self.stats = {}
+
+    def is_due(self, timesteps: int) -> bool:
+        return timesteps % self.check_interval == 0
+
+    def should_stop(self) -> bool:
+        return ((self.status == self.STEADY and self.stop_on_steady) or
+                (self.status == self.DIVERGED and self.stop_on_divergence))
+
+    def check(self, names: List[str], before: List[np.ndarray], after: List[np.ndarray], timestep: float) -> str:
+        stats = {}
+        diverged = False
+        steady = True
+        for name, old, new in zip(names, before, after):
+            lo = float(new.min())
+            hi = float(new.max())
+            with np.errstate(over='ignore', invalid='ignore'):
+                change = float(np.abs(new - old).max()) / timestep if timestep else 0.0
+            stats[name] = {'min': lo, 'max': hi, 'mean': float(new.mean()), 'max_change': change}
+            if not (np.isfinite(lo) and np.isfinite(hi)) or max(abs(lo), abs(hi)) > self.divergence_limit:
+                diverged = True
+            if not change <= self.steady_tolerance:
+                steady = False
+        self.stats = stats
+        if diverged:
+            self.status = self.DIVERGED
+        elif steady:
+            self.status = self.STEADY
+        else:
+            self.status = self.RUNNING
+        return self.status
+
+
+class RDSystem:
+    """A reaction-diffusion system on a regular grid, loaded from a Ready
+    .vti pattern with a `formula` or Python `kernel` rule and advanced with NumPy.
+
+    Use `step(n)` to advance; attach a `RunMonitor` as `monitor` to have
+    long runs stop early once they converge or blow up. With `workers` > 1
+    the grid is split into that many slabs which are updated on a thread pool
+    (NumPy releases the GIL inside its array operations); call `close()`, or
+    use the system as a context manager, to shut the pool down. Per-phase timings
+    (boundary, laplacian, formula, kernel) are collected in `perf` once it is
+    enabled.
+
+    A `kernel` rule holds a Python function working on whole arrays (see
+    `kernel_rule.load_kernel`). If the rule also carries the equivalent
+    `<formula>`, the kernel is checked against it when the pattern is loaded.
+    """
+
+    def __init__(self, path: str, monitor: Optional[RunMonitor] = None, workers: int = 1,
+                 perf: Optional[PerfCounters] = None):
+        self.path = path
+        self.monitor = monitor
+        self.workers = workers
+        self.perf = perf if perf is not None else PerfCounters()
+        self.timesteps = 0
+        self._pool = None
+        self._pool_workers = 0
+        try:
+            root = ET.parse(path).getroot()
+        except ET.ParseError as e:
+            raise ValueError(f'Failed to parse XML: {e}')
+        if root.get('type') != 'ImageData':
+            raise ValueError(f'Only ImageData patterns can be run, not {root.get("type")}')
+        rd = root.find('RD')
+        rule = rd.find('rule') if rd is not None else None
+        if rule is None:
+            raise ValueError('Pattern has no <RD><rule> element')
+
+        self.rule_name = rule.get('name', '')
+        self.rule_type = rule.get('type', 'formula')
+        if self.rule_type not in ('formula', 'kernel'):
+            raise ValueError(f'Unsupported rule type: {self.rule_type}')
+        self.wrap = rule.get('wrap', '1') == '1'
+        self.accuracy = rule.get('accuracy', 'medium')
+        self.params = {p.get('name'): float(p.text) for p in rule.findall('param')}
+        self.timestep = self.params.get('timestep', 1.0)
+        element = rule.find(self.rule_type)
+        if element is None:
+            raise ValueError(f'{self.rule_type} rule has no <{self.rule_type}> element')
+        n = int(element.get('number_of_chemicals', '1'))
+        self.chemical_names = [chr(ord('a') + i) for i in range(n)]
+        # a kernel rule may keep its formula as the reference to check against
+        formula = rule.find('formula')
+        self.formula = None
+        self._code = None
+        self._laplacians = []
+        if formula is not None:
+            self.formula = translate_formula(formula.text or '')
+            known = set(self.params) | {'x_pos', 'y_pos', 'z_pos'}
+            for name in self.chemical_names:
+                known |= {name, 'delta_' + name, 'laplacian_' + name}
+            tree = check_formula(self.formula, known)
+            self._code = compile(tree, f'<formula {self.rule_name}>', 'exec')
+            self._laplacians = [i for i, name in enumerate(self.chemical_names)
+                                if re.search(rf'\blaplacian_{name}\b', self.formula)]
+        self.kernel = None
+        self._kernel = None
+        if self.rule_type == 'kernel':
+            if element.get('language') != 'python':
+                raise ValueError('OpenCL kernels are not supported')
+            self.kernel = textwrap.dedent(element.text or '')
+            self._kernel = load_kernel(self.kernel, element.get('function', 'rd_compute'))
+
+        self.render_settings = {}
+        rs = rd.find('render_settings')
+        if rs is not None:
+            self.render_settings = {child.tag: dict(child.attrib) for child in rs}
+
+        image = root.find('ImageData')
+        e = [int(v) for v in image.get('WholeExtent').split()]
+        nx, ny, nz = e[1] - e[0] + 1, e[3] - e[2] + 1, e[5] - e[4] + 1
+        self._set_shape((nz, ny, nx))
+
+        self.initial_pattern_generator = rd.find('initial_pattern_generator')
+        if self.initial_pattern_generator is not None and self.initial_pattern_generator.get('apply_when_loading', 'true') == 'true':
+            self.chemicals = [np.zeros(self.shape, np.float32) for _ in self.chemical_names]
+            self.generate_initial_pattern(self.initial_pattern_generator)
+        else:
+            self.chemicals = self._read_chemicals(root, image)
+        self.chemical_ranges = {name: (float(c.min()), float(c.max()))
+                                for name, c in zip(self.chemical_names, self.chemicals)}
+        if self._kernel is not None and self._code is not None:
+            self.validate_kernel()
+
+    @property
+    def dimensionality(self) -> int:
+        return sum(1 for s in self.shape if s > 1)
+
+    @property
+    def number_of_cells(self) -> int:
+        return int(np.prod(self.shape))
+
+    def render_setting(self, name: str, default=None):
+        return self.render_settings.get(name, {}).get('value', default)
+
+    def set_dimensions(self, x: int, y: int = 1, z: int = 1):
+        """Resize the grid, then re-apply the initial pattern generator."""
+        self._set_shape((z, y, x))
+        self.chemicals = [np.zeros(self.shape, np.float32) for _ in self.chemical_names]
+        if self.initial_pattern_generator is not None:
+            self.generate_initial_pattern(self.initial_pattern_generator)
+        self.timesteps = 0
+
+    def positions(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Normalised cell-centre coordinates x_pos, y_pos, z_pos (broadcastable)."""
+        nz, ny, nx = self.shape
+        x = ((np.arange(nx, dtype=np.float32) + 0.5) / nx).reshape(1, 1, nx)
+        y = ((np.arange(ny, dtype=np.float32) + 0.5) / ny).reshape(1, ny, 1)
+        z = ((np.arange(nz, dtype=np.float32) + 0.5) / nz).reshape(nz, 1, 1)
+        return x, y, z
+
+    def _read_chemicals(self, root: ET.Element, image: ET.Element) -> List[np.ndarray]:
+        piece = image.find('Piece')
+        arrays = read_data_arrays(root, piece.find('PointData'))
+        if all(name in arrays for name in self.chemical_names):
+            columns = [arrays[name] for name in self.chemical_names]
+        else:
+            # older patterns keep every chemical in one multi-component array
+            values = next(iter(arrays.values()), None)
+            if values is None or values.ndim != 2 or values.shape[1] < len(self.chemical_names):
+                raise ValueError('Pattern does not contain data for every chemical')
+            columns = [values[:, i] for i in range(len(self.chemical_names))]
+        return [c.astype(np.float32).reshape(self.shape) for c in columns]
+
+    # ---- initial pattern generator ----
+
+    def generate_initial_pattern(self, generator: ET.Element):
+        """Apply the <overlay> elements of an <initial_pattern_generator>."""
+        if generator.get('zero_first', 'true') == 'true':
+            for c in self.chemicals:
+                c.fill(0)
+        for overlay in generator.findall('overlay'):
+            name = overlay.get('chemical', 'a')
+            if name not in self.chemical_names:
+                continue
+            target = self.chemicals[self.chemical_names.index(name)]
+            children = list(overlay)
+            if len(children) < 2:
+                continue
+            op, fill, shapes = children[0].tag, children[1], children[2:]
+            mask = np.zeros(self.shape, bool)
+            for shape in shapes:
+                mask |= self._shape_mask(shape)
+            if not mask.any():
+                continue
+            values = self._fill_values(fill)[mask]
+            if op == 'overwrite':
+                target[mask] = values
+            elif op == 'add':
+                target[mask] += values
+            elif op == 'subtract':
+                target[mask] -= values
+            elif op == 'multiply':
+                target[mask] *= values
+            elif op == 'divide':
+                target[mask] /= values
+            else:
+                raise ValueError(f'Unsupported overlay operation: {op}')
+
+    def _fill_values(self, fill: ET.Element) -> np.ndarray:
+        if fill.tag == 'constant':
+            return np.full(self.shape, float(fill.get('value', '0')), np.float32)
+        if fill.tag == 'white_noise':
+            low, high = float(fill.get('low', '0')), float(fill.get('high', '1'))
+            return np.random.uniform(low, high, self.shape).astype(np.float32)
+        if fill.tag == 'other_chemical':
+            return self.chemicals[self.chemical_names.index(fill.get('chemical', 'a'))].copy()
+        raise ValueError(f'Unsupported overlay fill: {fill.tag}')
+
+    def _shape_mask(self, shape: ET.Element) -> np.ndarray:
+        # shapes are given in normalised coordinates; axes of size 1 are ignored
+        coords = self._positions[::-1]  # z, y, x
+        active = [n > 1 for n in self.shape]
+        points = [np.array([float(p.get(k, '0')) for k in 'zyx'])
+                  for p in shape if p.tag.lower() == 'point3d']
+        if shape.tag == 'everywhere':
+            return np.ones(self.shape, bool)
+        if shape.tag == 'rectangle' and len(points) == 2:
+            lo, hi = np.minimum(*points), np.maximum(*points)
+            mask = np.ones(self.shape, bool)
+            for axis, coord in enumerate(coords):
+                if active[axis]:
+                    mask &= (coord >= lo[axis]) & (coord <= hi[axis])
+            return mask
+        if shape.tag == 'circle' and points:
+            radius = float(shape.get('radius', '0'))
+            dist2 = np.zeros(self.shape, np.float32)
+            for axis, coord in enumerate(coords):
+                if active[axis]:
+                    dist2 = dist2 + (coord - points[0][axis]) ** 2
+            return dist2 <= radius * radius
+        return np.zeros(self.shape, bool)
+
+    # ---- stepping ----
+
+    def _set_shape(self, shape: Tuple[int, int, int]):
+        self.shape = shape
+        self._positions = self.positions()
+        self._build_stencil()
+
+    def _build_stencil(self):
+        """Pick Laplacian weights for the grid dimensionality and accuracy."""
+        axes = [i for i, n in enumerate(self.shape) if n > 1]
+        faces = []
+        for axis in axes:
+            for sign in (-1, 1):
+                offset = [0, 0, 0]
+                offset[axis] = sign
+                faces.append(tuple(offset))
+        diagonals = []
+        for i, a in enumerate(axes):
+            for b in axes[i + 1:]:
+                for sa in (-1, 1):
+                    for sb in (-1, 1):
+                        offset = [0, 0, 0]
+                        offset[a], offset[b] = sa, sb
+                        diagonals.append(tuple(offset))
+        if self.accuracy == 'low' or len(axes) < 2:
+            weights = [(o, 1.0) for o in faces]
+            centre, divisor = -2.0 * len(axes), 1.0
+        elif len(axes) == 2:
+            # isotropic 9-point stencil
+            weights = [(o, 4.0) for o in faces] + [(o, 1.0) for o in diagonals]
+            centre, divisor = -20.0, 6.0
+        else:
+            # isotropic 19-point stencil
+            weights = [(o, 2.0) for o in faces] + [(o, 1.0) for o in diagonals]
+            centre, divisor = -24.0, 6.0
+        dx = self.params.get('dx', 1.0)
+        scale = 1.0 / (divisor * dx * dx)
+        self._axes = axes
+        self._pad = [(1, 1) if i in axes else (0, 0) for i in range(3)]
+        self._stencil = [(offset, np.float32(w * scale)) for offset, w in weights]
+        self._centre = np.float32(centre * scale)
+
+    def _tiles(self) -> List[Tuple[slice, slice, slice]]:
+        """Split the grid into `workers` slabs along its slowest-varying axis."""
+        axis = self._axes[0] if self._axes else 0
+        n = self.shape[axis]
+        bounds = np.linspace(0, n, max(1, min(self.workers, n)) + 1).astype(int)
+        tiles = []
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            region = [slice(0, size) for size in self.shape]
+            region[axis] = slice(int(lo), int(hi))
+            tiles.append(tuple(region))
+        return tiles
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None or self._pool_workers != self.workers:
+            self.close()
+            self._pool = ThreadPoolExecutor(self.workers)
+            self._pool_workers = self.workers
+        return self._pool
+
+    def close(self):
+        """Shut down the worker threads; a later `step()` starts them again."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._pool_workers = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def pad_boundary(self, u: np.ndarray) -> np.ndarray:
+        """Return `u` with a one-cell halo: wrapped if toroidal, else copied from the edge."""
+        return np.pad(u, self._pad, mode='wrap' if self.wrap else 'edge')
+
+    def _laplacian_tile(self, padded: np.ndarray, region) -> np.ndarray:
+        pad = [p[0] for p in self._pad]
+        centre = tuple(slice(r.start + p, r.stop + p) for r, p in zip(region, pad))
+        result = padded[centre] * self._centre
+        for offset, w in self._stencil:
+            index = tuple(slice(r.start + p + o, r.stop + p + o) for r, p, o in zip(region, pad, offset))
+            result += w * padded[index]
+        return result
+
+    def laplacian(self, u: np.ndarray) -> np.ndarray:
+        return self._laplacian_tile(self.pad_boundary(u), tuple(slice(0, n) for n in self.shape))
+
+    def _tile_positions(self, region) -> Dict[str, np.ndarray]:
+        return {name: pos[tuple(r if n > 1 else slice(None) for r, n in zip(region, pos.shape))]
+                for name, pos in zip(('x_pos', 'y_pos', 'z_pos'), self._positions)}
+
+    def _update_tile(self, region, padded: Dict[int, np.ndarray], out: List[np.ndarray]):
+        names = self.chemical_names
+        ns = {'__builtins__': {}}
+        ns.update(FORMULA_FUNCTIONS)
+        ns.update(self.params)
+        ns.update(self._tile_positions(region))
+        for name, u in zip(names, self.chemicals):
+            ns[name] = u[region]
+            ns['delta_' + name] = 0.0
+        perf = self.perf
+        # blow-ups are reported by the monitor rather than as numpy warnings
+        with np.errstate(over='ignore', invalid='ignore'):
+            with perf.phase('laplacian'):
+                for i in self._laplacians:
+                    ns['laplacian_' + names[i]] = self._laplacian_tile(padded[i], region)
+            with perf.phase('formula'):
+                exec(self._code, ns)
+                dt = np.float32(self.timestep)
+                for name, o in zip(names, out):
+                    o[region] = ns[name] + dt * ns['delta_' + name]
+
+    def _kernel_tile(self, region, padded: Dict[int, np.ndarray], out: List[np.ndarray]):
+        chemicals = {name: u[region] for name, u in zip(self.chemical_names, self.chemicals)}
+        params = dict(self.params, timestep=self.timestep)
+        params.update(self._tile_positions(region))
+        with np.errstate(over='ignore', invalid='ignore'):
+            with self.perf.phase('kernel'):
+                result = self._kernel(chemicals, KernelNeighbours(self, padded, region), params)
+                if not isinstance(result, dict):
+                    raise ValueError('Kernel must return a dict of new values keyed by chemical')
+                for name, o in zip(self.chemical_names, out):
+                    o[region] = result.get(name, chemicals[name])
+
+    def _advance(self, rule_type: Optional[str] = None) -> List[np.ndarray]:
+        kernel = (rule_type or self.rule_type) == 'kernel'
+        # kernels may ask for any chemical's neighbours, so pad them all
+        needed = range(len(self.chemicals)) if kernel else self._laplacians
+        with self.perf.phase('boundary'):
+            padded = {i: self.pad_boundary(self.chemicals[i]) for i in needed}
+        out = [np.empty(self.shape, np.float32) for _ in self.chemical_names]
+        update = self._kernel_tile if kernel else self._update_tile
+        tiles = self._tiles()
+        if len(tiles) > 1:
+            list(self._executor().map(lambda region: update(region, padded, out), tiles))
+        else:
+            update(tiles[0], padded, out)
+        return out
+
+    def validate_kernel(self, tolerance: float = 1e-4) -> float:
+        """Check one step of the kernel against the rule's reference formula.
+
+        Both are applied to the current chemicals; raises ValueError if any
+        value differs by more than `tolerance` (relative to its magnitude, at
+        least 1) and returns the largest difference otherwise.
+        """
+        if self._kernel is None or self._code is None:
+            raise ValueError('Validation needs a kernel rule that also has a <formula>')
+        expected = self._advance('formula')
+        actual = self._advance('kernel')
+        worst = 0.0
+        for name, e, a in zip(self.chemical_names, expected, actual):
+            with np.errstate(over='ignore', invalid='ignore'):
+                error = float(np.max(np.abs(a - e) / np.maximum(np.abs(e), 1.0)))
+            if not error <= tolerance:
+                raise ValueError(f'Kernel disagrees with formula for chemical {name} (error {error:g})')
+            worst = max(worst, error)
+        return worst
+
+    def step(self, num_steps: int = 1) -> int:
+        """Advance up to `num_steps` timesteps and return how many were taken.
+
+        Returns early if the attached monitor reports a run that should stop.
+        """
+        monitor = self.monitor
+        taken = num_steps
+        for i in range(num_steps):
+            before = self.chemicals
+            self.chemicals = self._advance()
+            self.timesteps += 1
+            if monitor is not None and monitor.is_due(self.timesteps):
+                with self.perf.phase('monitor'):
+                    monitor.check(self.chemical_names, before, self.chemicals, self.timestep)
+                for name, s in monitor.stats.items():
+                    self.chemical_ranges[name] = (s['min'], s['max'])
+                if monitor.should_stop():
+                    taken = i + 1
+                    break
+        self.perf.count_steps(taken, self.number_of_cells)
+        return taken
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run a Ready .vti pattern without the GUI.')
+    parser.add_argument('patterns', nargs='+', help='pattern files to run')
+    parser.add_argument('--steps', type=int, default=10000, help='maximum number of timesteps')
+    parser.add_argument('--check-interval', type=int, default=100, help='timesteps between convergence checks')
+    parser.add_argument('--tolerance', type=float, default=1e-6, help='max rate of change counted as steady')
+    parser.add_argument('--divergence-limit', type=float, default=1e6, help='magnitude counted as blow-up')
+    parser.add_argument('--profile', action='store_true', help='print per-phase timings for each run')
+    args = parser.parse_args()
+
+    for path in args.patterns:
+        monitor = RunMonitor(args.check_interval, args.tolerance, args.divergence_limit)
+        try:
+            system = RDSystem(path, monitor)
+        except ValueError as e:
+            print(f'{path}: skipped ({e})')
+            continue
+        if args.profile:
+            system.perf.enable()
+        system.step(args.steps)
+        print(f'{path}: {monitor.status} after {system.timesteps} timesteps')
+        for name, (lo, hi) in system.chemical_ranges.items():
+            print(f'  {name}: RangeMin={lo:g} RangeMax={hi:g}')
+        if args.profile:
+            print('  ' + system.perf.report().replace('\n', '\n  '))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,4 @@
-from PyQt5.QtCore import Qt, QTimer, QSize
+from PyQt5.QtCore import Qt, QTimer, QSize, pyqtSignal
 from PyQt5.QtGui import QIcon, QPixmap, QColor
 from PyQt5.QtWidgets import (
     QMainWindow, QAction, QToolBar, QLabel, QTextEdit, QWidget,
@@ -7,9 +7,12 @@ from PyQt5.QtWidgets import (
     QStyle
 )
 from info_panel import InfoPanel
+from perf_counters import PerfCounters
 import os
-from vtkmodules.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
-import vtkmodules.all as vtk
+import time
+
+# VTK (vtk_canvas) and NumPy (rd_engine) are imported on first use so the
+# window can appear before those libraries have loaded.
 
 
 class RenderCanvas(QWidget):
@@ -61,6 +64,11 @@ class RenderCanvas(QWidget):
 
 
 class MainWindow(QMainWindow):
+    # emitted once: after the window's first paint, and when the work deferred
+    # until then (VTK view, patterns tree) has finished
+    first_painted = pyqtSignal()
+    startup_finished = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle('Reaction Diffusion Simulator')
@@ -70,16 +78,26 @@ class MainWindow(QMainWindow):
         self.is_running = False
         self.current_paint_value = 0.5
         self.current_brush_size_index = 1
-
-        # central render canvas
-        self.vtk_canvas = VTKCanvas(self)
-        self.setCentralWidget(self.vtk_canvas)
+        self.system = None
+        self.selected_path = None  # pattern picked in the tree, loaded on Open/Run/Step
+        self.timesteps_per_render = 16
+        self.perf = PerfCounters()
+
+        # central render canvas: a plain placeholder until the window has been
+        # painted, then the VTK view (see _finish_startup)
+        self.vtk_canvas = None
+        self.current_tool = 'pointer'
+        self._startup_done = False
+        self.setCentralWidget(RenderCanvas(self))
 
         # status bar
         self.status = QStatusBar()
         self.setStatusBar(self.status)
         self.status_label = QLabel('Stopped. Timesteps: 0')
         self.status.addWidget(self.status_label)
+        self.perf_label = QLabel()
+        self.perf_label.setVisible(False)
+        self.status.addPermanentWidget(self.perf_label)
         self.timesteps = 0
 
         # timer to simulate OnIdle driven run loop
@@ -92,9 +110,34 @@ class MainWindow(QMainWindow):
         self._create_toolbars()
         self._create_docks()
 
+    def paintEvent(self, ev):
+        super().paintEvent(ev)
+        if not self._startup_done:
+            self._startup_done = True
+            self.first_painted.emit()
+            # posted, so it runs once this paint has been flushed to the screen
+            QTimer.singleShot(0, self._finish_startup)
+
+    def _finish_startup(self):
+        """Deferred start-up work, run once the window has been painted."""
+        self.build_patterns_tree()
+        self._init_render_view()
+        self.startup_finished.emit()
+
+    def _init_render_view(self):
+        """Create the VTK canvas, importing VTK on first call."""
+        if self.vtk_canvas is not None:
+            return
+        from vtk_canvas import VTKCanvas
+        self.vtk_canvas = VTKCanvas(self)
+        self.vtk_canvas.set_mode(self.current_tool)
+        self.vtk_canvas.set_brush_size(self.current_brush_size_index)
+        self.setCentralWidget(self.vtk_canvas)
+
     def _create_actions(self):
         self.act_new = QAction('New Pattern...', self)
         self.act_open = QAction('Open Pattern...', self)
+        self.act_open.triggered.connect(self._open_pattern)
         self.act_save = QAction('Save Pattern...', self)
         self.act_about = QAction('About', self)
 
@@ -104,6 +147,7 @@ class MainWindow(QMainWindow):
 
         self.act_step = QAction('Step', self)
         self.act_step.triggered.connect(self.step_once)
+        self._update_run_actions()
 
         # paint tools
         self.act_pointer = QAction('Pointer', self)
@@ -145,6 +189,10 @@ class MainWindow(QMainWindow):
         self.act_fullscreen.setCheckable(True)
         self.act_fullscreen.triggered.connect(self._toggle_fullscreen)
         viewm.addAction(self.act_fullscreen)
+        self.act_perf = QAction('Performance HUD', self)
+        self.act_perf.setCheckable(True)
+        self.act_perf.triggered.connect(self._toggle_perf)
+        viewm.addAction(self.act_perf)
 
     def _create_toolbars(self):
         # file toolbar
@@ -188,10 +236,9 @@ class MainWindow(QMainWindow):
         self.patterns.itemDoubleClicked.connect(self.on_pattern_activated)
         dock_patterns = QDockWidget('Patterns Pane', self)
         dock_patterns.setWidget(self.patterns)
+        self.patterns.itemExpanded.connect(self._populate_folder)
         self.addDockWidget(Qt.LeftDockWidgetArea, dock_patterns)
-
-        # build tree from patterns directory relative to repo
-        self.build_patterns_tree()
+        # the tree is filled from the patterns directory after the first paint
 
         # Info pane (use InfoPanel for richer file previews)
         self.info = InfoPanel()
@@ -209,7 +256,8 @@ class MainWindow(QMainWindow):
         self.addDockWidget(Qt.RightDockWidgetArea, dock_help)
 
     def build_patterns_tree(self):
-        """Scan the repository `patterns/` directory and populate the tree."""
+        """Populate the tree with the top level of the repository `patterns/`
+        directory. Sub-folders are listed when first expanded."""
         # patterns directory is ../patterns relative to this file
         root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'patterns'))
         self.patterns.clear()
@@ -219,61 +267,56 @@ class MainWindow(QMainWindow):
         # prepare folder icon (use project's icons/open-folder.png if present)
         icon_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'icons', 'open-folder.png'))
         if os.path.exists(icon_path):
-            folder_icon = QIcon(icon_path)
+            self._folder_icon = QIcon(icon_path)
         else:
             # fallback to standard directory icon
-            folder_icon = self.style().standardIcon(QStyle.SP_DirIcon)
+            self._folder_icon = self.style().standardIcon(QStyle.SP_DirIcon)
 
         # set icon size for tree items
         self.patterns.setIconSize(QSize(24, 24))
 
-        def add_dir(parent_item, full_path):
-            try:
-                entries = sorted(os.listdir(full_path), key=lambda s: s.lower())
-            except Exception:
-                return
-            for name in entries:
-                path = os.path.join(full_path, name)
-                if os.path.isdir(path):
-                    node = QTreeWidgetItem(parent_item, [name])
-                    node.setData(0, Qt.UserRole, None)
-                    node.setIcon(0, folder_icon)
-                    add_dir(node, path)
-                else:
-                    leaf = QTreeWidgetItem(parent_item, [name])
-                    # store absolute path for activation
-                    leaf.setData(0, Qt.UserRole, path)
-
-        # top-level: show each top-level folder as a root node
-        top_entries = sorted(os.listdir(root_dir), key=lambda s: s.lower())
-        for entry in top_entries:
-            full = os.path.join(root_dir, entry)
-            if os.path.isdir(full):
-                root_item = QTreeWidgetItem(self.patterns, [entry])
-                root_item.setData(0, Qt.UserRole, None)
-                root_item.setIcon(0, folder_icon)
-                add_dir(root_item, full)
+        self._add_entries(self.patterns, root_dir)
+        for i in range(self.patterns.topLevelItemCount()):
+            item = self.patterns.topLevelItem(i)
+            if item.data(0, Qt.UserRole + 1):
+                item.setExpanded(True)
+
+    def _add_entries(self, parent_item, full_path):
+        """Add one tree level for `full_path`; folders remember their path in
+        Qt.UserRole + 1 and are filled in by `_populate_folder`."""
+        try:
+            entries = sorted(os.listdir(full_path), key=lambda s: s.lower())
+        except Exception:
+            return
+        for name in entries:
+            path = os.path.join(full_path, name)
+            item = QTreeWidgetItem(parent_item, [name])
+            if os.path.isdir(path):
+                item.setData(0, Qt.UserRole, None)
+                item.setData(0, Qt.UserRole + 1, path)
+                item.setIcon(0, self._folder_icon)
+                item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
             else:
-                leaf = QTreeWidgetItem(self.patterns, [entry])
-                leaf.setData(0, Qt.UserRole, os.path.join(root_dir, entry))
+                # store absolute path for activation
+                item.setData(0, Qt.UserRole, path)
 
-        self.patterns.expandToDepth(0)
+    def _populate_folder(self, item):
+        path = item.data(0, Qt.UserRole + 1)
+        if path and item.childCount() == 0:
+            self._add_entries(item, path)
+            item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicatorWhenChildless)
 
     def on_pattern_activated(self, item, column):
-        """Called when user double-clicks a tree item; if it's a file open/show it."""
+        """Called when user double-clicks a tree item; if it's a file show it.
+
+        Only the header is read here; the pattern is loaded into the engine
+        on Open or the first Run/Step, so clicking through files stays fast.
+        """
         path = item.data(0, Qt.UserRole)
         if path:
-            # show selected pattern in status and delegate display to InfoPanel
-            self.status_label.setText(f'Selected: {os.path.basename(path)}')
-            try:
-                self.info.show_file(path)
-            except Exception:
-                # fallback message
-                try:
-                    size = os.path.getsize(path)
-                except Exception:
-                    size = 'unknown'
-                self.info.set_info(f'Cannot display file contents (error).\nPath: {path}\nSize: {size}')
+            self._show_pattern_info(path)
+            self.selected_path = path
+            self._update_run_actions()
         else:
             # toggle expand/collapse for directories
             if item.isExpanded():
@@ -281,6 +324,130 @@ class MainWindow(QMainWindow):
             else:
                 item.setExpanded(True)
 
+    def _show_pattern_info(self, path):
+        # show selected pattern in status and delegate display to InfoPanel
+        self.status_label.setText(f'Selected: {os.path.basename(path)}')
+        try:
+            self.info.show_file(path)
+        except Exception:
+            # fallback message
+            try:
+                size = os.path.getsize(path)
+            except Exception:
+                size = 'unknown'
+            self.info.set_info(f'Cannot display file contents (error).\nPath: {path}\nSize: {size}')
+
+    def _open_pattern(self):
+        patterns_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'patterns'))
+        path, _ = QFileDialog.getOpenFileName(self, 'Open Pattern', patterns_dir,
+                                              'VTK files (*.vti *.vtu);;All files (*)')
+        if path:
+            self._show_pattern_info(path)
+            self.selected_path = path
+            self.load_system(path)
+
+    def _update_run_actions(self):
+        enabled = self.system is not None or self.selected_path is not None
+        self.act_run.setEnabled(enabled)
+        self.act_step.setEnabled(enabled)
+
+    def _ensure_loaded(self):
+        """Load the selected pattern if it is not the one in the engine."""
+        if self.selected_path is not None and (self.system is None or self.system.path != self.selected_path):
+            self.load_system(self.selected_path)
+        return self.system is not None
+
+    def load_system(self, path):
+        """Load `path` into the engine so Run/Step advance it; meshes and
+        unsupported rules leave the window without a system."""
+        self._stop_run()
+        if self.system is not None:
+            self.system.close()
+        from rd_engine import RDSystem, RunMonitor
+        try:
+            self.system = RDSystem(path, RunMonitor(), perf=self.perf)
+        except Exception as e:
+            self.system = None
+            self.selected_path = None
+            self.timesteps = 0
+            if self.vtk_canvas is not None:
+                self.vtk_canvas.clear()
+            self._update_run_actions()
+            self.status_label.setText(f'Selected: {os.path.basename(path)} (cannot run: {e})')
+            return
+        self._update_run_actions()
+        self.timesteps = 0
+        self.timesteps_per_render = int(self.system.render_setting('timesteps_per_render', 16))
+        self.timesteps_label.setText(f'Timesteps per render: {self.timesteps_per_render}')
+        self._init_render_view()
+        self.vtk_canvas.show_system(self.system)
+        self._render()
+
+    def _advance(self, num_steps):
+        """Advance the loaded system and stop the run if it converged or blew up.
+
+        Returns False if the engine raised; the run is then stopped and the
+        error shown in the status bar.
+        """
+        if self.system is None:
+            self._stop_run()
+            return False
+        try:
+            self.system.step(num_steps)
+        except Exception as e:
+            self._stop_run()
+            self.status_label.setText(f'Stopped. Timesteps: {self.system.timesteps} (error: {e})')
+            return False
+        self.timesteps = self.system.timesteps
+        monitor = self.system.monitor
+        if monitor.should_stop():
+            self._stop_run()
+        return True
+
+    def _stop_run(self):
+        if self.is_running:
+            self.act_run.setChecked(False)
+            self.toggle_run(False)
+
+    def _status_text(self):
+        text = ('Running.' if self.is_running else 'Stopped.') + f' Timesteps: {self.timesteps}'
+        if self.system is not None and self.system.monitor.status != self.system.monitor.RUNNING:
+            text += f' ({self.system.monitor.status})'
+        return text
+
+    def _render(self):
+        if self.vtk_canvas is None:
+            return
+        if self.system is not None:
+            with self.perf.phase('render_upload'):
+                self.vtk_canvas.update_system(self.system)
+        with self.perf.phase('vtk_render'):
+            try:
+                self.vtk_canvas.vtkWidget.GetRenderWindow().Render()
+            except Exception:
+                pass
+
+    def _toggle_perf(self, checked):
+        if checked:
+            self.perf.enable()
+            self.perf_label.setText('Measuring...')
+        else:
+            self.perf.disable()
+        self.perf_label.setVisible(checked)
+
+    def _update_perf_label(self):
+        """Refresh the HUD about once a second from the counters, then restart them."""
+        if not self.perf.enabled or self.perf.elapsed() < 1.0:
+            return
+        s = self.perf.summary()
+        self.perf_label.setText(f"{s['steps_per_s']:.0f} steps/s | {s['ms_per_frame']:.1f} ms/frame | "
+                                f"{s['mcells_per_s']:.1f} Mcells/s")
+        phases = sorted(s['phases_ms_per_frame'].items(), key=lambda kv: -kv[1])
+        lines = [f"frame interval: {s['frame_interval_ms']:.1f} ms"]
+        lines += [f'{name}: {ms:.2f} ms/frame' for name, ms in phases]
+        self.perf_label.setToolTip('\n'.join(lines))
+        self.perf.reset()
+
     def _toggle_fullscreen(self):
         if self.act_fullscreen.isChecked():
             self.showFullScreen()
@@ -288,45 +455,44 @@ class MainWindow(QMainWindow):
             self.showNormal()
 
     def toggle_run(self, checked):
+        if checked and not self._ensure_loaded():
+            self.act_run.setChecked(False)
+            return
         self.is_running = checked
         if self.is_running:
+            if self.system is not None:
+                self.system.monitor.reset()
             self.timer.start()
-            self.status_label.setText('Running. Timesteps: %d' % self.timesteps)
             self.act_run.setText('Stop')
         else:
             self.timer.stop()
-            self.status_label.setText('Stopped. Timesteps: %d' % self.timesteps)
             self.act_run.setText('Run')
+        self.status_label.setText(self._status_text())
 
     def step_once(self):
         # perform a single timestep
-        self.timesteps += 1
-        self.status_label.setText(('Running.' if self.is_running else 'Stopped.') + f' Timesteps: {self.timesteps}')
-        # simulate updating render
-        if hasattr(self, 'vtk_canvas'):
-            try:
-                self.vtk_canvas.vtkWidget.GetRenderWindow().Render()
-            except Exception:
-                pass
+        if not self._ensure_loaded() or not self._advance(1):
+            return
+        self.status_label.setText(self._status_text())
+        self._render()
 
     def _on_idle(self):
         # called periodically when running
-        # simulate variable number of steps per timer tick
-        self.timesteps += 1
-        self.status_label.setText('Running. Timesteps: %d' % self.timesteps)
-        # update VTK render
-        if hasattr(self, 'vtk_canvas'):
-            try:
-                self.vtk_canvas.vtkWidget.GetRenderWindow().Render()
-            except Exception:
-                pass
+        start = time.perf_counter()
+        if not self._advance(self.timesteps_per_render):
+            return
+        self._render()
+        self.status_label.setText(self._status_text())
+        self.perf.count_frame(time.perf_counter() - start)
+        self._update_perf_label()
 
     def _set_tool(self, name):
         for a in self.paint_actions:
             a.setChecked(False)
         mapping = {'pointer': self.act_pointer, 'pencil': self.act_pencil, 'brush': self.act_brush, 'picker': self.act_picker}
         mapping[name].setChecked(True)
-        if hasattr(self, 'vtk_canvas'):
+        self.current_tool = name
+        if self.vtk_canvas is not None:
             try:
                 self.vtk_canvas.set_mode(name)
             except Exception:
@@ -337,7 +503,7 @@ class MainWindow(QMainWindow):
             a.setChecked(False)
         self.brush_size_actions[idx].setChecked(True)
         self.current_brush_size_index = idx
-        if hasattr(self, 'vtk_canvas'):
+        if self.vtk_canvas is not None:
             try:
                 self.vtk_canvas.set_brush_size(idx)
             except Exception:
@@ -364,61 +530,3 @@ class MainWindow(QMainWindow):
         pix = QPixmap(size, size)
         pix.fill(QColor(v, 0, 0))
         self.color_swatch.setPixmap(pix)
-
-
-class VTKCanvas(QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.vtkWidget = QVTKRenderWindowInteractor(self)
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(self.vtkWidget)
-
-        # Create renderer and basic scene
-        self.ren = vtk.vtkRenderer()
-        rw = self.vtkWidget.GetRenderWindow()
-        rw.AddRenderer(self.ren)
-        self.ren.SetBackground(0.15, 0.15, 0.2)
-
-        # quick test actor (sphere)
-        src = vtk.vtkSphereSource()
-        src.SetRadius(0.5)
-        src.Update()
-        mapper = vtk.vtkPolyDataMapper()
-        mapper.SetInputConnection(src.GetOutputPort())
-        actor = vtk.vtkActor()
-        actor.SetMapper(mapper)
-        self.ren.AddActor(actor)
-
-        # initialize interactor (do not call Start() — let Qt loop drive it)
-        self.vtkWidget.Initialize()
-        self.vtkWidget.Enable()
-        self.ren.ResetCamera()
-        rw.Render()
-
-        # keep interactor handy for event binding
-        self.interactor = self.vtkWidget.GetRenderWindow().GetInteractor()
-        # add a pick observer
-        self.interactor.AddObserver("LeftButtonPressEvent", self._on_left_click_vtk)
-
-    def _on_left_click_vtk(self, caller, event):
-        # get mouse position and pick in the renderer
-        x, y = self.interactor.GetEventPosition()
-        picker = vtk.vtkCellPicker()
-        picker.SetTolerance(1e-6)
-        picked = picker.Pick(x, y, 0, self.ren)
-        if picked:
-            pos = picker.GetPickPosition()
-            print("VTK picked:", pos)
-        # forward normally so interactor style can process it too
-        return
-
-    # optional stubs so MainWindow can call these methods without error
-    def set_mode(self, mode):
-        # mode could be 'pointer','pencil','brush','picker'
-        self._mode = mode
-
-    def set_brush_size(self, idx):
-        sizes = [2, 4, 8, 16, 32]
-        self._brush_size = sizes[idx] if 0 <= idx < len(sizes) else sizes[1]
-
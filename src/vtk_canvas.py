@@ -0,0 +1,178 @@
+import numpy as np
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from vtkmodules.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
+from vtkmodules.util import numpy_support
+from vtkmodules.vtkCommonCore import vtkFloatArray, vtkLookupTable
+from vtkmodules.vtkCommonDataModel import vtkImageData
+from vtkmodules.vtkFiltersGeneral import vtkWarpScalar
+from vtkmodules.vtkFiltersGeometry import vtkImageDataGeometryFilter
+from vtkmodules.vtkFiltersSources import vtkSphereSource
+from vtkmodules.vtkImagingCore import vtkImageExtractComponents
+from vtkmodules.vtkRenderingCore import (
+    vtkActor, vtkCellPicker, vtkDataSetMapper, vtkPolyDataMapper, vtkRenderer
+)
+# register the OpenGL rendering backend and the default interactor style
+import vtkmodules.vtkInteractionStyle  # noqa: F401
+import vtkmodules.vtkRenderingOpenGL2  # noqa: F401
+
+
+class VTKCanvas(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.vtkWidget = QVTKRenderWindowInteractor(self)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.vtkWidget)
+
+        # Create renderer and basic scene
+        self.ren = vtkRenderer()
+        rw = self.vtkWidget.GetRenderWindow()
+        rw.AddRenderer(self.ren)
+        self.ren.SetBackground(0.15, 0.15, 0.2)
+
+        # quick test actor (sphere)
+        src = vtkSphereSource()
+        src.SetRadius(0.5)
+        src.Update()
+        mapper = vtkPolyDataMapper()
+        mapper.SetInputConnection(src.GetOutputPort())
+        actor = vtkActor()
+        actor.SetMapper(mapper)
+        self.ren.AddActor(actor)
+
+        # initialize interactor (do not call Start() — let Qt loop drive it)
+        self.vtkWidget.Initialize()
+        self.vtkWidget.Enable()
+        self.ren.ResetCamera()
+        rw.Render()
+
+        # keep interactor handy for event binding
+        self.interactor = self.vtkWidget.GetRenderWindow().GetInteractor()
+        # add a pick observer
+        self.interactor.AddObserver("LeftButtonPressEvent", self._on_left_click_vtk)
+
+    def show_system(self, system):
+        """Replace the scene with `system`, laid out from its render settings.
+
+        Every chemical lives in one multi-component array of a single
+        vtkImageData, so a frame is one upload however many chemicals are
+        shown. With `show_multiple_chemicals` each chemical gets its own actor
+        side by side; on 2D grids `show_displacement_mapped_surface` warps the
+        image by the chemical value inside the VTK pipeline.
+        """
+        names = system.chemical_names
+        nz, ny, nx = system.shape
+        self.image = vtkImageData()
+        self.image.SetDimensions(nx, ny, nz)
+        values = vtkFloatArray()
+        values.SetName('chemicals')
+        values.SetNumberOfComponents(len(names))
+        values.SetNumberOfTuples(nx * ny * nz)
+        self.image.GetPointData().SetScalars(values)
+        # numpy view onto VTK's buffer, shaped to take all chemicals in one copy
+        self._values = numpy_support.vtk_to_numpy(values).reshape(nz, ny, nx, len(names))
+        self.update_system(system)
+
+        active = system.render_setting('active_chemical', names[0])
+        if system.render_setting('show_multiple_chemicals') == 'true':
+            shown = range(len(names))
+        else:
+            shown = [names.index(active) if active in names else 0]
+        displaced = (system.dimensionality == 2 and
+                     system.render_setting('show_displacement_mapped_surface') == 'true')
+
+        self.ren.RemoveAllViewProps()
+        for slot, i in enumerate(shown):
+            actor = self._displaced_actor(system, i) if displaced else self._image_actor(system, i)
+            actor.SetPosition(slot * nx * 1.1, 0, 0)
+            self.ren.AddActor(actor)
+        self.ren.ResetCamera()
+
+    def _image_actor(self, system, component):
+        mapper = vtkDataSetMapper()
+        mapper.SetInputData(self.image)
+        mapper.SetLookupTable(self._lookup_table(system))
+        mapper.SetColorModeToMapScalars()
+        # the mapper, not the lookup table, picks which component is coloured
+        mapper.SetScalarModeToUsePointFieldData()
+        mapper.ColorByArrayComponent('chemicals', component)
+        mapper.UseLookupTableScalarRangeOn()
+        actor = vtkActor()
+        actor.SetMapper(mapper)
+        return actor
+
+    def _displaced_actor(self, system, component):
+        low = float(system.render_setting('low', 0))
+        high = float(system.render_setting('high', 1))
+        scale = float(system.render_setting('vertical_scale_2D', 15))
+        extract = vtkImageExtractComponents()
+        extract.SetInputData(self.image)
+        extract.SetComponents(component)
+        surface = vtkImageDataGeometryFilter()
+        surface.SetInputConnection(extract.GetOutputPort())
+        warp = vtkWarpScalar()
+        warp.SetInputConnection(surface.GetOutputPort())
+        warp.UseNormalOn()
+        warp.SetNormal(0, 0, 1)
+        # the low..high colour range spans `vertical_scale_2D` cells of height
+        warp.SetScaleFactor(scale / (high - low) if high != low else scale)
+        mapper = vtkPolyDataMapper()
+        mapper.SetInputConnection(warp.GetOutputPort())
+        mapper.SetLookupTable(self._lookup_table(system))
+        mapper.UseLookupTableScalarRangeOn()
+        actor = vtkActor()
+        actor.SetMapper(mapper)
+        if system.render_setting('color_displacement_mapped_surface', 'true') != 'true':
+            mapper.ScalarVisibilityOff()
+            colour = system.render_settings.get('surface_color', {})
+            actor.GetProperty().SetColor(*[float(colour.get(k, 1)) for k in 'rgb'])
+        return actor
+
+    def update_system(self, system):
+        """Upload the current values of every chemical."""
+        np.stack(system.chemicals, axis=-1, out=self._values)
+        self.image.GetPointData().GetScalars().Modified()
+        self.image.Modified()
+
+    def clear(self):
+        """Remove the shown system, leaving an empty view."""
+        self.ren.RemoveAllViewProps()
+        self.vtkWidget.GetRenderWindow().Render()
+
+    @staticmethod
+    def _lookup_table(system):
+        low = float(system.render_setting('low', 0))
+        high = float(system.render_setting('high', 1))
+        c0 = system.render_settings.get('color_low', {})
+        c1 = system.render_settings.get('color_high', {})
+        rgb0 = [float(c0.get(k, d)) for k, d in zip('rgb', (0, 0, 1))]
+        rgb1 = [float(c1.get(k, d)) for k, d in zip('rgb', (1, 0, 0))]
+        lut = vtkLookupTable()
+        lut.SetNumberOfTableValues(256)
+        lut.SetTableRange(low, high)
+        for i in range(256):
+            t = i / 255.0
+            lut.SetTableValue(i, *[a + (b - a) * t for a, b in zip(rgb0, rgb1)], 1.0)
+        return lut
+
+    def _on_left_click_vtk(self, caller, event):
+        # get mouse position and pick in the renderer
+        x, y = self.interactor.GetEventPosition()
+        picker = vtkCellPicker()
+        picker.SetTolerance(1e-6)
+        picked = picker.Pick(x, y, 0, self.ren)
+        if picked:
+            pos = picker.GetPickPosition()
+            print("VTK picked:", pos)
+        # forward normally so interactor style can process it too
+        return
+
+    # optional stubs so MainWindow can call these methods without error
+    def set_mode(self, mode):
+        # mode could be 'pointer','pencil','brush','picker'
+        self._mode = mode
+
+    def set_brush_size(self, idx):
+        sizes = [2, 4, 8, 16, 32]
+        self._brush_size = sizes[idx] if 0 <= idx < len(sizes) else sizes[1]
+
@@ -1,5 +1,6 @@
+import textwrap
 import xml.etree.ElementTree as ET
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 class XMLFileParser:
     """
@@ -10,6 +11,7 @@ class XMLFileParser:
         self.tree = None
         self.root = None
         self.parsed_data = {}
+        self.header = {}
 
     def parse(self) -> None:
         """Parse the XML file and store the root element."""
@@ -22,6 +24,57 @@ class XMLFileParser:
         except Exception as e:
             raise ValueError(f"Error reading file: {e}")
 
+    def parse_header(self) -> Dict[str, Any]:
+        """Read only the pattern metadata: the <RD> element plus the grid
+        extents or mesh size, stopping at the first <DataArray> so no array
+        data is parsed. The result is stored in `self.header` and returned."""
+        header: Dict[str, Any] = {}
+        try:
+            for event, elem in ET.iterparse(self.file_path, events=('start', 'end')):
+                if event == 'start':
+                    if elem.tag == 'DataArray':
+                        break
+                    if elem.tag == 'VTKFile':
+                        header['file_type'] = elem.get('type')
+                    elif elem.tag == 'ImageData' and elem.get('WholeExtent'):
+                        e = [int(v) for v in elem.get('WholeExtent').split()]
+                        dims = (e[1] - e[0] + 1, e[3] - e[2] + 1, e[5] - e[4] + 1)
+                        header['dimensions'] = dims
+                        header['number_of_cells'] = dims[0] * dims[1] * dims[2]
+                    elif elem.tag == 'Piece' and elem.get('NumberOfCells'):
+                        header['number_of_points'] = int(elem.get('NumberOfPoints', '0'))
+                        header['number_of_cells'] = int(elem.get('NumberOfCells'))
+                elif elem.tag == 'RD':
+                    header.update(self._extract_rd(elem))
+                    elem.clear()
+        except ET.ParseError as e:
+            if not header:
+                raise ValueError(f"Failed to parse XML: {e}")
+        except Exception as e:
+            raise ValueError(f"Error reading file: {e}")
+        self.header = header
+        return header
+
+    @staticmethod
+    def _extract_rd(rd: ET.Element) -> Dict[str, Any]:
+        """Collect the rule and description fields of an <RD> element."""
+        info: Dict[str, Any] = {'format_version': rd.get('format_version')}
+        description = rd.find('description')
+        if description is not None and description.text:
+            info['description'] = '\n'.join(line.strip() for line in description.text.strip().splitlines())
+        rule = rd.find('rule')
+        if rule is None:
+            return info
+        info['rule'] = dict(rule.attrib)
+        info['params'] = [(p.get('name'), (p.text or '').strip()) for p in rule.findall('param')]
+        for tag in ('formula', 'kernel'):
+            body = rule.find(tag)
+            if body is not None:
+                info[tag] = textwrap.dedent((body.text or '').strip('\n')).rstrip()
+                info[tag + '_attributes'] = dict(body.attrib)
+                info.setdefault('number_of_chemicals', body.get('number_of_chemicals'))
+        return info
+
     def _extract_content(self, element: ET.Element) -> Dict[str, Any]:
         """Recursively extract tag, attributes, and children from the XML element."""
         content = {
@@ -38,13 +91,17 @@ class XMLFileParser:
         return self._format_summary(self.parsed_data, level=0)
 
     def _format_summary(self, data: Dict[str, Any], level: int = 0) -> str:
+        lines = []
+        self._format_lines(data, level, lines)
+        return ''.join(lines)
+
+    def _format_lines(self, data: Dict[str, Any], level: int, lines: List[str]) -> None:
+        # collect lines and join once; concatenating strings per level is quadratic
         indent = '  ' * level
-        summary = f"{indent}<{data['tag']}"
+        attrs = ''
         if data['attributes']:
-            attrs = ' '.join(f'{k}="{v}"' for k, v in data['attributes'].items())
-            summary += f" {attrs}"
-        summary += ">\n"
+            attrs = ' ' + ' '.join(f'{k}="{v}"' for k, v in data['attributes'].items())
+        lines.append(f"{indent}<{data['tag']}{attrs}>\n")
         for child in data['children']:
-            summary += self._format_summary(child, level + 1)
-        summary += f"{indent}</{data['tag']}>\n"
-        return summary
+            self._format_lines(child, level + 1, lines)
+        lines.append(f"{indent}</{data['tag']}>\n")
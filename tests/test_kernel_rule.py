@@ -0,0 +1,94 @@
+import os
+
+import numpy as np
+import pytest
+
+from kernel_rule import KernelNeighbours, load_kernel
+from rd_engine import RDSystem
+
+
+PATTERNS = os.path.join(os.path.dirname(__file__), '..', 'patterns', 'GrayScott1984')
+KERNEL_PATTERN = os.path.join(PATTERNS, 'Pearson1993_kernel.vti')
+
+
+@pytest.mark.parametrize('body', [
+    'import os',
+    'from os import path',
+    'def rd_compute(c, n, p):\n    return c.__class__',
+    'def rd_compute(c, n, p):\n    return n._system',
+    'def rd_compute(c, n, p):\n    return _secret',
+    'def rd_compute(c, n, p):\n    g = (x for x in [])\n    return g.gi_frame',
+    "def rd_compute(c, n, p):\n    return '{0.__class__}'.format(c)",
+    "def rd_compute(c, n, p):\n    return np.add.reduce(c['a'])",
+])
+def test_guard_rejects_unsafe_source(body):
+    with pytest.raises(ValueError, match='may not use'):
+        load_kernel(body)
+
+
+def test_kernel_runs_without_normal_builtins():
+    kernel = load_kernel("def rd_compute(c, n, p):\n    return open('x')")
+    with pytest.raises(NameError):
+        kernel({}, None, {})
+
+
+def test_missing_function_is_reported():
+    with pytest.raises(ValueError, match='rd_compute'):
+        load_kernel('def other(c, n, p):\n    return c')
+
+
+def test_opencl_kernel_is_not_supported(tmp_path):
+    text = open(KERNEL_PATTERN).read().replace(' language="python"', '')
+    path = tmp_path / 'opencl.vti'
+    path.write_text(text)
+    with pytest.raises(ValueError, match='OpenCL kernels are not supported'):
+        RDSystem(str(path))
+
+
+def test_kernel_matches_formula():
+    np.random.seed(0)
+    system = RDSystem(KERNEL_PATTERN)
+    assert system.validate_kernel() <= 1e-4
+
+
+def test_validate_kernel_rejects_wrong_kernel(tmp_path):
+    # drop F from the decay term of b
+    text = open(KERNEL_PATTERN).read().replace("(F + params['K']) * b", "params['K'] * b")
+    path = tmp_path / 'wrong.vti'
+    path.write_text(text)
+    with pytest.raises(ValueError, match='disagrees with formula for chemical b'):
+        RDSystem(str(path))
+
+
+def test_offset_returns_x_plus_one_neighbour():
+    np.random.seed(0)
+    system = RDSystem(KERNEL_PATTERN)
+    a = system.chemicals[0]
+    padded = {i: system.pad_boundary(u) for i, u in enumerate(system.chemicals)}
+    region = tuple(slice(0, n) for n in system.shape)
+    neighbours = KernelNeighbours(system, padded, region)
+    assert np.array_equal(neighbours.offset('a', dx=1), np.roll(a, -1, axis=2))
+    assert np.array_equal(neighbours.offset('a', dx=1)[:, :, :-1], a[:, :, 1:])
+
+
+def test_malicious_reference_formula_is_rejected_before_validation(tmp_path, monkeypatch):
+    text = open(KERNEL_PATTERN).read().replace(
+        'delta_a = D_a', 'delta_a = ().__class__.__base__.__subclasses__() + D_a')
+    path = tmp_path / 'evil.vti'
+    path.write_text(text)
+    monkeypatch.setattr(RDSystem, 'validate_kernel', lambda self: pytest.fail('validated an unchecked formula'))
+    with pytest.raises(ValueError, match='Formula may not use Attribute'):
+        RDSystem(str(path))
+
+
+def test_kernel_errors_surface_from_step(tmp_path):
+    # no reference formula, so the bad call only shows up when stepping
+    text = open(KERNEL_PATTERN).read()
+    start = text.index('<formula')
+    end = text.index('</formula>') + len('</formula>')
+    text = text[:start] + text[end:]
+    path = tmp_path / 'open.vti'
+    path.write_text(text.replace('reaction = a * b * b', "reaction = open('x')"))
+    system = RDSystem(str(path))
+    with pytest.raises(NameError):
+        system.step(1)
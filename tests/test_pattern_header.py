@@ -0,0 +1,82 @@
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from xml_file_parser import XMLFileParser
+
+
+PATTERNS = os.path.join(os.path.dirname(__file__), '..', 'patterns', 'GrayScott1984')
+
+IMAGE_HEADER = """<?xml version="1.0"?>
+<VTKFile type="ImageData" version="0.1" byte_order="LittleEndian">
+  <RD format_version="6">
+    <description>
+      A test pattern.
+    </description>
+    <rule name="Test" type="kernel" wrap="0" accuracy="2">
+      <param name="timestep">0.5</param>
+      <kernel number_of_chemicals="2" block_size_x="4" block_size_y="2" use_local_memory="1">
+        a_out[index] = a_in[index];
+      </kernel>
+    </rule>
+  </RD>
+  <ImageData WholeExtent="0 63 0 31 0 0" Origin="0 0 0" Spacing="1 1 1">
+  <Piece Extent="0 63 0 31 0 0">
+    <PointData>
+      <DataArray type="Float32" Name="a" format="ascii">
+"""
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_header_stops_at_first_data_array(tmp_path):
+    # everything after the first DataArray is broken and unterminated
+    path = write(tmp_path, 'broken.vti', IMAGE_HEADER + '1 2 3 <<& </Nope>\n')
+    with pytest.raises(ValueError):
+        XMLFileParser(path).parse()
+    header = XMLFileParser(path).parse_header()
+    assert header['file_type'] == 'ImageData'
+    assert header['rule']['name'] == 'Test'
+    assert header['params'] == [('timestep', '0.5')]
+    assert header['number_of_chemicals'] == '2'
+    assert header['description'] == 'A test pattern.'
+
+
+def test_cells_from_whole_extent(tmp_path):
+    header = XMLFileParser(write(tmp_path, 'grid.vti', IMAGE_HEADER)).parse_header()
+    assert header['dimensions'] == (64, 32, 1)
+    assert header['number_of_cells'] == 64 * 32
+
+
+def test_mesh_counts_from_piece():
+    path = os.path.join(PATTERNS, 'lion.vtu')
+    piece = ET.parse(path).getroot().find('UnstructuredGrid/Piece')
+    header = XMLFileParser(path).parse_header()
+    assert header['file_type'] == 'UnstructuredGrid'
+    assert 'dimensions' not in header
+    assert header['number_of_points'] == int(piece.get('NumberOfPoints'))
+    assert header['number_of_cells'] == int(piece.get('NumberOfCells'))
+
+
+@pytest.fixture
+def qapp():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_info_panel_shows_kernel_attributes(qapp, tmp_path):
+    from info_panel import InfoPanel
+
+    header = XMLFileParser(write(tmp_path, 'grid.vti', IMAGE_HEADER)).parse_header()
+    lines = InfoPanel().format_header(header).splitlines()
+    assert 'Block size: 4 x 2 x 1' in lines
+    assert 'Use local memory: yes' in lines
+    assert 'Number of cells: 2,048' in lines
+    assert 'Accuracy: high' in lines
+    assert 'Toroidal wrap-around: no' in lines
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from perf_counters import PerfCounters
+
+
+def test_disabled_phase_records_nothing():
+    perf = PerfCounters()
+    with perf.phase('laplacian'):
+        pass
+    perf.count_steps(10, 100)
+    perf.count_frame(0.5)
+    assert perf.phase('laplacian') is perf.phase('formula')
+    assert dict(perf.totals) == {}
+    assert perf.steps == 0 and perf.frames == 0
+
+
+def test_phase_accumulates_time_and_calls():
+    perf = PerfCounters(enabled=True)
+    for _ in range(3):
+        with perf.phase('formula'):
+            time.sleep(0.001)
+    assert perf.counts['formula'] == 3
+    assert perf.totals['formula'] >= 0.003
+
+
+def test_summary_rates(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, 'perf_counter', lambda: now[0])
+    perf = PerfCounters(enabled=True)
+    perf.count_steps(50, 1000)
+    perf.count_frame(0.01)
+    perf.count_frame(0.03)
+    perf.add('render', 0.004)
+    now[0] += 2.0
+    s = perf.summary()
+    assert s['elapsed_s'] == pytest.approx(2.0)
+    assert s['steps_per_s'] == pytest.approx(25.0)
+    assert s['mcells_per_s'] == pytest.approx(50 * 1000 / 2.0 / 1e6)
+    assert s['ms_per_frame'] == pytest.approx(20.0)
+    assert s['frame_interval_ms'] == pytest.approx(1000.0)
+    assert s['phases_ms_per_frame']['render'] == pytest.approx(2.0)
+
+
+def test_enable_resets_counters():
+    perf = PerfCounters(enabled=True)
+    perf.count_steps(5, 10)
+    perf.disable()
+    perf.enable()
+    assert perf.steps == 0
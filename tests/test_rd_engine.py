@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import pytest
+
+from rd_engine import RDSystem, RunMonitor, check_formula, translate_formula
+
+
+PEARSON = os.path.join(os.path.dirname(__file__), '..', 'patterns', 'GrayScott1984', 'Pearson1993.vti')
+
+
+def test_translate_formula_drops_float_suffixes_and_declarations():
+    text = """
+        // comment
+        float4 k = 2.0f * a;  /* block
+        comment */
+        const float r = 1.5e-3F;
+        delta_a = k + r - 1.f;
+    """
+    assert translate_formula(text) == 'k = 2.0 * a\nr = 1.5e-3\ndelta_a = k + r - 1.'
+
+
+def test_uniform_state_stops_steady():
+    monitor = RunMonitor(check_interval=10)
+    system = RDSystem(PEARSON, monitor)
+    system.chemicals = [np.ones(system.shape, np.float32), np.zeros(system.shape, np.float32)]
+    taken = system.step(1000)
+    assert monitor.status == RunMonitor.STEADY
+    assert taken == 10
+    assert system.timesteps == 10
+
+
+def test_large_timestep_stops_diverged_at_first_check():
+    np.random.seed(0)
+    monitor = RunMonitor(check_interval=50)
+    system = RDSystem(PEARSON, monitor)
+    system.timestep = 5.0
+    taken = system.step(1000)
+    assert monitor.status == RunMonitor.DIVERGED
+    assert taken == 50
+    assert not np.isfinite(monitor.stats['a']['min']) or abs(monitor.stats['a']['max']) > monitor.divergence_limit
+
+
+def test_step_without_stop_takes_all_steps():
+    np.random.seed(0)
+    monitor = RunMonitor(check_interval=10, stop_on_steady=False)
+    system = RDSystem(PEARSON, monitor)
+    assert system.step(25) == 25
+    assert monitor.status == RunMonitor.RUNNING
+
+
+KNOWN = {'a', 'delta_a', 'laplacian_a', 'D_a'}
+
+
+def test_check_formula_accepts_arithmetic_and_local_names():
+    check_formula('k = fmax(a, 0.5) * -2\ndelta_a = D_a * laplacian_a + k * (a > 1)', KNOWN)
+
+
+@pytest.mark.parametrize('formula, message', [
+    ('delta_a = ().__class__', 'Attribute'),
+    ('delta_a = a.conjugate()', 'may not use Attribute'),
+    ('delta_a = a[0]', 'Subscript'),
+    ('delta_a = [c for c in a]', 'ListComp'),
+    ('delta_a = (lambda: 1)()', 'Lambda'),
+    ('delta_a = smoothstep(0, 1, a)', 'unsupported function smoothstep'),
+    ('delta_a = b', 'unknown name b'),
+    ('delta_a = k\nk = 1', 'unknown name k'),
+])
+def test_check_formula_rejects(formula, message):
+    with pytest.raises(ValueError, match=message):
+        check_formula(formula, KNOWN)
+
+
+def test_malicious_formula_is_rejected_on_load(tmp_path):
+    text = open(PEARSON).read().replace(
+        'delta_a = D_a', 'delta_a = ().__class__.__base__.__subclasses__() + D_a')
+    path = tmp_path / 'evil.vti'
+    path.write_text(text)
+    with pytest.raises(ValueError, match='Attribute'):
+        RDSystem(str(path))